@@ -18,6 +18,16 @@ __all__ = [
     "get",
 ]
 
+_KINDS = {
+    "radix": RadixDedupe,
+    "pytricia": RadixDedupe,
+    "set": SimpleSetDedupe,
+    "simpleset": SimpleSetDedupe,
+    "simple": SimpleSetDedupe,
+    "domain": DomainTrieDedupe,
+    "domaintrie": DomainTrieDedupe,
+}
+
 def get(kind: str):
     """
     Factory helper to create a dedupe instance.
@@ -30,11 +40,7 @@ def get(kind: str):
     Raises ValueError on unknown kind.
     """
 
-    kind = (kind or "").lower()
-    if kind in ("radix", "pytricia"):
-        return RadixDedupe()
-    if kind in ("set", "simpleset", "simple"):
-        return SimpleSetDedupe()
-    if kind in ("domain", "domaintrie"):
-        return DomainTrieDedupe()
-    raise ValueError(f"Unknown dedupe kind: {kind}")
\ No newline at end of file
+    factory = _KINDS.get(kind) or _KINDS.get((kind or "").lower())
+    if factory is None:
+        raise ValueError(f"Unknown dedupe kind: {kind}")
+    return factory()
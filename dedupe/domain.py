@@ -19,16 +19,19 @@ class DomainTrieDedupe:
     def add(self, item):
         return self.trie.add(item)
 
+    def removeMany(self, items):
+        for item in items:
+            self.remove(item)
+
     def remove(self, item):
-        item = item.lower()
-        self.trie.remove(item)
+        return self.trie.remove(item)
 
     def contains(self, item):
-        item = item.lower()
         return self.trie.contains(item)
 
     def all(self):
-        return sorted(list(self.trie.iter_domains()))
+        """Return all domains as a sorted list."""
+        return sorted(self.trie.iter_domains())
 
     def reset(self):
         self.trie = DomainTrie()
\ No newline at end of file
@@ -1,119 +1,245 @@
+import sys
+
+
 class DomainTrie:
-    _TERM = "__terminal__"
-    _WILDCARD = "__wildcard__"
+    """
+    Trie of domains keyed by reversed labels (com -> example -> www).
+
+    Nodes are integer ids into flat per-node arrays. Each node's edges are a
+    label -> child_id dict (None for leaves), and the terminal/wildcard
+    markers are bytearrays indexed by node id.
+    """
+    _ROOT = 0
 
     def __init__(self):
-        self.root = {}
+        self._labels = [None]           # label of the edge leading into each node
+        self._kids = [None]             # label -> child id for each node, None if it has none
+        self._term = bytearray(1)       # node's domain is stored
+        self._wild = bytearray(1)       # '*.' + node's domain is stored
+        self._free = []                 # released node ids, reused before growing
+        self._sorted_kids = {}          # node id -> child ids ordered by label, built on iteration
+        self._size = 0
+
+    @classmethod
+    def load_from_iter(cls, lines):
+        """
+        Build a trie from an iterable of domains, e.g. the lines of a list file.
+
+        Blank lines and '#' comments are skipped. Wildcards are inserted before
+        concrete domains, broadest first, so no insert ever has more specific
+        entries to clear. Unlike sequential add() calls the result does not
+        depend on line order: an apex is kept even if listed before its wildcard.
+        """
+        wildcards = []
+        domains = []
+        for line in lines:
+            entry = line.strip()
+            if not entry or entry.startswith('#'):
+                continue
+            (wildcards if entry.startswith('*.') else domains).append(entry)
+
+        trie = cls()
+        wildcards.sort(key=lambda entry: entry.count('.'))
+        for entry in wildcards:
+            trie.add(entry)
+        for entry in domains:
+            trie.add(entry)
+        return trie
 
     def _normalize(self, domain):
-        cleaned = (domain or "").strip().lower().strip('.')
+        # strip() returns the same object when there is nothing to strip, and
+        # most inputs are already lowercase, so the common case copies nothing.
+        cleaned = (domain or "").strip()
+        if not cleaned.islower():
+            cleaned = cleaned.lower()
+        cleaned = cleaned.strip('.')
         if not cleaned:
             raise ValueError("domain must be a non-empty string")
         return cleaned
 
+    def _new_node(self, parent, label):
+        # Labels repeat heavily (com, www, cdn, ...); intern them so every node
+        # and edge key shares one string object per distinct label
+        label = sys.intern(label)
+        if self._free:
+            node = self._free.pop()
+            self._labels[node] = label
+        else:
+            node = len(self._labels)
+            self._labels.append(label)
+            self._kids.append(None)
+            self._term.append(0)
+            self._wild.append(0)
+
+        kids = self._kids[parent]
+        if kids is None:
+            self._kids[parent] = {label: node}
+        else:
+            kids[label] = node
+            self._sorted_kids.pop(parent, None)
+        return node
+
+    def _release_node(self, parent, node):
+        """Detach an empty leaf node from its parent and recycle its id."""
+        kids = self._kids[parent]
+        del kids[self._labels[node]]
+        if not kids:
+            self._kids[parent] = None
+        self._sorted_kids.pop(parent, None)
+
+        self._labels[node] = None
+        self._free.append(node)
+
+    def _clear_descendants(self, node):
+        """Release every node below node. Returns the number of entries dropped."""
+        dropped = 0
+        stack = [node]
+        while stack:
+            parent = stack.pop()
+            kids = self._kids[parent]
+            if kids is None:
+                continue
+            self._kids[parent] = None
+            self._sorted_kids.pop(parent, None)
+            for kid in kids.values():
+                dropped += self._term[kid] + self._wild[kid]
+                self._term[kid] = 0
+                self._wild[kid] = 0
+                self._labels[kid] = None
+                self._free.append(kid)
+                stack.append(kid)
+        return dropped
+
     def add(self, domain):
-        normalized = self._normalize(domain)
-        original_labels = normalized.split('.')
-        is_wildcard = original_labels[0] == '*'
-        effective_labels = original_labels[1:] if is_wildcard else original_labels
+        labels = self._normalize(domain).split('.')
+        is_wildcard = labels[0] == '*'
+        first = 1 if is_wildcard else 0
 
-        if not effective_labels:
+        if first == len(labels):
             raise ValueError("wildcard must target at least one domain label")
 
-        labels = list(reversed(effective_labels))
-
-        node = self.root
-        for label in labels:
-            if self._WILDCARD in node:
+        # Walk labels right to left (com -> example -> www) without reversing a copy
+        kids = self._kids
+        wild = self._wild
+        node = self._ROOT
+        for idx in range(len(labels) - 1, first - 1, -1):
+            if wild[node]:
                 return False
-            node = node.setdefault(label, {})
+            children = kids[node]
+            child = None if children is None else children.get(labels[idx])
+            if child is None:
+                child = self._new_node(node, labels[idx])
+            node = child
 
         if is_wildcard:
-            node.clear()  # remove all more specific entries
-            node[self._WILDCARD] = True
-        else:
-            node[self._TERM] = True
+            # Remove all more specific entries, including the apex
+            dropped = self._clear_descendants(node) + self._term[node] + wild[node]
+            self._term[node] = 0
+            wild[node] = 1
+            self._size += 1 - dropped
+        elif not self._term[node]:
+            self._term[node] = 1
+            self._size += 1
         return True
 
     def remove(self, domain):
         """Remove a domain or wildcard from the trie. Returns True if removed, False if not found."""
-        normalized = self._normalize(domain)
-        original_labels = normalized.split('.')
-        is_wildcard = original_labels[0] == '*'
-        effective_labels = original_labels[1:] if is_wildcard else original_labels
+        labels = self._normalize(domain).split('.')
+        is_wildcard = labels[0] == '*'
+        first = 1 if is_wildcard else 0
 
-        if not effective_labels:
+        if first == len(labels):
             raise ValueError("wildcard must target at least one domain label")
 
-        labels = list(reversed(effective_labels))
-
         # Navigate to the target node, tracking the path
-        path = [(self.root, None)]
-        node = self.root
-        for label in labels:
-            if label not in node:
+        kids = self._kids
+        path = []
+        node = self._ROOT
+        for idx in range(len(labels) - 1, first - 1, -1):
+            children = kids[node]
+            child = None if children is None else children.get(labels[idx])
+            if child is None:
                 return False  # Domain not in trie
-            path.append((node, label))
-            node = node[label]
+            path.append(node)
+            node = child
 
         # Check if the target marker exists
-        marker = self._WILDCARD if is_wildcard else self._TERM
-        if marker not in node:
+        marker = self._wild if is_wildcard else self._term
+        if not marker[node]:
             return False  # Domain not in trie
 
         # Remove the marker
-        del node[marker]
+        marker[node] = 0
+        self._size -= 1
 
         # Clean up empty nodes from leaf to root
-        for i in range(len(path) - 1, 0, -1):
-            parent, label = path[i]
-            child = parent[label]
-            # Remove child if it's now empty (no markers, no children)
-            if not child:
-                del parent[label]
-            else:
-                break  # Stop if node still has content
+        while path and not (self._term[node] or self._wild[node] or self._kids[node]):
+            parent = path.pop()
+            self._release_node(parent, node)
+            node = parent
 
         return True
 
     def contains(self, domain):
-        normalized = self._normalize(domain)
-        labels = list(reversed(normalized.split('.')))
-
-        node = self.root
-        for idx, label in enumerate(labels):
-            if label not in node:
+        labels = self._normalize(domain).split('.')
+
+        kids = self._kids
+        wild = self._wild
+        node = self._ROOT
+        for idx in range(len(labels) - 1, -1, -1):
+            children = kids[node]
+            node = None if children is None else children.get(labels[idx])
+            if node is None:
                 return False
-            node = node[label]
-            # Check wildcard only when exactly one more label remains (immediate child only)
-            remaining = len(labels) - idx - 1
-            if self._WILDCARD in node and remaining == 1:
+            # idx labels remain; a wildcard covers exactly one more (immediate child only)
+            if idx == 1 and wild[node]:
                 return True
 
-        return self._TERM in node
+        return bool(self._term[node])
 
     def __len__(self):
         """Return the count of stored domains (both concrete and wildcards)."""
-        return self._count_entries(self.root)
-
-    def _count_entries(self, node):
-        count = 0
-        if self._TERM in node or self._WILDCARD in node:
-            count = 1
-        for key, child in node.items():
-            if key not in (self._TERM, self._WILDCARD):
-                count += self._count_entries(child)
-        return count
+        return self._size
+
+    def _kids_in_order(self, node):
+        """Return the child ids of node sorted by label, cached until its children change."""
+        if not self._kids[node]:
+            return ()
+        ordered = self._sorted_kids.get(node)
+        if ordered is None:
+            ordered = [kid for _, kid in sorted(self._kids[node].items())]
+            self._sorted_kids[node] = ordered
+        return ordered
 
     def iter_domains(self):
         """Yield all stored domains in lexicographic order."""
-        yield from self._iter_recursive(self.root, [])
-
-    def _iter_recursive(self, node, path):
-        if self._WILDCARD in node:
-            yield '*.' + '.'.join(reversed(path))
-        if self._TERM in node:
-            yield '.'.join(reversed(path))
-        for label, child in sorted(node.items()):
-            if label not in (self._TERM, self._WILDCARD):
-                yield from self._iter_recursive(child, path + [label])
\ No newline at end of file
+        labels = self._labels
+        term = self._term
+        wild = self._wild
+        kids_in_order = self._kids_in_order
+
+        # Depth-first walk; path holds the labels of the nodes whose children
+        # are currently being iterated on the stack (the root has no label).
+        path = []
+        stack = [iter(kids_in_order(self._ROOT))]
+        while stack:
+            node = next(stack[-1], None)
+            if node is None:
+                stack.pop()
+                if path:
+                    path.pop()
+                continue
+
+            path.append(labels[node])
+            if wild[node] or term[node]:
+                domain = '.'.join(reversed(path))
+                if wild[node]:
+                    yield '*.' + domain
+                if term[node]:
+                    yield domain
+
+            kids = kids_in_order(node)
+            if kids:
+                stack.append(iter(kids))
+            else:
+                path.pop()
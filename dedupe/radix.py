@@ -1,6 +1,7 @@
-import pytricia
 import ipaddress
 
+import pytricia
+
 def test():
     pt = pytricia.PyTricia()
     pt.insert("192.168.1.0/24", "local network")
@@ -44,8 +45,25 @@ class RadixDedupe:
             return self.pt_v6
         
     def addMany(self, cidrs):
+        nets_v4 = []
+        nets_v6 = []
         for cidr in cidrs:
-            self.add(cidr)
+            net = parse_cidr(cidr)
+            (nets_v4 if net.version == 4 else nets_v6).append(net)
+
+        for pt, nets in ((self.pt_v4, nets_v4), (self.pt_v6, nets_v6)):
+            # Inserting broader prefixes first means a prefix from this batch can
+            # never cover another one already inserted from it, so covered
+            # children only need pruning when the tree held entries beforehand.
+            prune = len(pt) > 0
+            nets.sort(key=lambda net: net.prefixlen)
+            for net in nets:
+                if net in pt:
+                    continue
+                pt.insert(net, True)
+                if prune and net.prefixlen < net.max_prefixlen:
+                    for child in pt.children(net):
+                        pt.delete(child)
 
     def add(self, cidr):
         net = parse_cidr(cidr)
@@ -55,25 +73,38 @@ class RadixDedupe:
         if net in pt:
             return False
         
-        # Insert and remove any existing CIDRs that are encompassed by the new CIDR
+        # Insert and remove any existing CIDRs that are encompassed by the new CIDR.
+        # A host route (/32, /128) cannot encompass anything, so skip the lookup.
         pt.insert(net, True)
-        for child in pt.children(net):
-            pt.delete(child)
+        if net.prefixlen < net.max_prefixlen:
+            for child in pt.children(net):
+                pt.delete(child)
 
         return True
     
+    def removeMany(self, cidrs):
+        for cidr in cidrs:
+            self.remove(cidr)
+
     def remove(self, cidr):
         net = parse_cidr(cidr)
         pt = self.__get_radix__(net)
-        pt.delete(cidr)
+
+        # Only exact entries can be removed; a covering CIDR is left untouched
+        if not pt.has_key(net):
+            return False
+
+        pt.delete(net)
+        return True
 
     def contains(self, cidr):
         net = parse_cidr(cidr)
         pt = self.__get_radix__(net)
-        return cidr in pt
+        return net in pt
 
     def all(self):
-        return sorted(list(self.pt_v4.keys()) + list(self.pt_v6.keys()))
+        """Return all CIDRs as a sorted list."""
+        return sorted(self.pt_v4.keys() + self.pt_v6.keys())
 
     def reset(self):
         self.pt_v4 = pytricia.PyTricia(32)
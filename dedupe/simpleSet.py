@@ -20,16 +20,23 @@ class SimpleSetDedupe:
         self.seen.add(item)
         return True
     
+    def removeMany(self, items):
+        self.seen.difference_update(item.lower() for item in items)
+
     def remove(self, item):
         item = item.lower()
-        self.seen.discard(item)
+        if item not in self.seen:
+            return False
+        self.seen.remove(item)
+        return True
 
     def contains(self, item):
         item = item.lower()
         return item in self.seen
     
     def all(self):
-        return sorted(list(self.seen))
+        """Return all items as a sorted list."""
+        return sorted(self.seen)
     
     def reset(self):
         self.seen.clear()
\ No newline at end of file
@@ -12,12 +12,20 @@ Example:
     python generate.py lists.yaml ./lists
 """
 
+import collections
+import contextlib
 import gzip
+import io
+import json
 import os
 import sys
+import traceback
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
 import requests
 import yaml
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 import dedupe
 import input as input_parsers
@@ -30,6 +38,15 @@ Usage: python generate.py <config_file> <output_dir>
   output_dir: Directory to save the generated list files (e.g., 'lists')
 """
 
+# Upper bound on concurrent source downloads (and pooled connections per host).
+MAX_FETCH_WORKERS = 32
+
+# (connect, read) timeouts in seconds for HTTP sources.
+FETCH_TIMEOUT = (5, 30)
+
+# Size of the blocks source content is read and parsed in.
+READ_CHUNK_SIZE = 1024 * 1024
+
 
 # ============================================================================
 # Logging Utilities
@@ -79,6 +96,12 @@ class Logger:
         prefix = '  ✓' if indent else '✓'
         print(Logger._format(message, prefix, Logger.GREEN))
     
+    @staticmethod
+    def error(message, indent=False):
+        """Print an error message."""
+        prefix = '  ✗' if indent else '✗'
+        print(Logger._format(message, prefix, Logger.RED))
+    
     @staticmethod
     def detail(key, value, indent=False):
         """Print a key-value detail."""
@@ -107,52 +130,125 @@ def load_config(config_path):
 # Source Fetching and Parsing
 # ============================================================================
 
-def fetch_content(url, binary=False):
+def _create_session():
     """
-    Fetch content from URL or local file.
+    Create the HTTP session shared by all fetch workers.
+    
+    Connections are kept alive and pooled across sources, transient gateway
+    errors are retried with backoff, and compressed transfer is advertised so
+    plain-text sources can be served gzip'd and are decoded transparently.
+    """
+    session = requests.Session()
+    session.headers['Accept-Encoding'] = 'gzip, deflate'
+    retries = Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+    adapter = HTTPAdapter(
+        pool_connections=MAX_FETCH_WORKERS,
+        pool_maxsize=MAX_FETCH_WORKERS,
+        max_retries=retries,
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+_SESSION = _create_session()
+
+
+@contextlib.contextmanager
+def open_content(url):
+    """
+    Open content from URL or local file as a binary stream.
+    
+    HTTP bodies are streamed rather than loaded into memory up front.
     
     Args:
         url: HTTP(S) URL or file:// path
-        binary: Whether to return binary content
         
-    Returns:
-        Content as bytes (binary=True) or string (binary=False)
+    Yields:
+        Readable binary file-like object
     """
     if url.startswith('http://') or url.startswith('https://'):
-        response = requests.get(url)
-        response.raise_for_status()
-        return response.content if binary else response.text
+        with _SESSION.get(url, stream=True, timeout=FETCH_TIMEOUT) as response:
+            response.raise_for_status()
+            # Undo any Content-Encoding (e.g. gzip transfer) while reading
+            response.raw.decode_content = True
+            yield response.raw
+        return
     
     # Handle local files
     file_path = url[7:] if url.startswith('file://') else url
-    mode = 'rb' if binary else 'r'
-    with open(file_path, mode) as f:
-        return f.read()
+    with open(file_path, 'rb') as f:
+        yield f
 
 
-def decompress_content(content, compression):
+def decompress_content(stream, compression):
     """
-    Decompress content based on compression type.
+    Wrap a binary stream to decompress it based on compression type.
     
     Args:
-        content: Raw content (string or bytes)
+        stream: Readable binary file-like object
         compression: Compression type ('gzip', 'none')
         
     Returns:
-        Decompressed string content
+        Readable binary file-like object yielding decompressed content
     """
     if compression == 'gzip':
-        return gzip.decompress(content).decode('utf-8')
+        return gzip.GzipFile(fileobj=stream)
     elif compression == 'none':
-        return content
+        return stream
     else:
         raise ValueError(f"Unknown compression type: {compression}")
 
 
+def iter_line_chunks(stream, chunk_size=READ_CHUNK_SIZE):
+    """
+    Read a binary stream in large blocks that each end on a line boundary.
+    
+    Args:
+        stream: Readable binary file-like object
+        chunk_size: Number of bytes to read at a time
+        
+    Yields:
+        Bytes holding one or more complete lines
+    """
+    pending = b''
+    while True:
+        block = stream.read(chunk_size)
+        if not block:
+            break
+        cut = block.rfind(b'\n') + 1
+        if cut:
+            yield pending + block[:cut]
+            pending = block[cut:]
+        else:
+            pending += block
+    if pending:
+        yield pending
+
+
+# Parsed entries of sources used by more than one list, keyed by _source_key().
+# Filled by prefetch_shared_sources() before lists are built.
+_SHARED_SOURCES = {}
+
+
+def _source_args(source):
+    """Return (url, compression, format_type, format_options) for a source config."""
+    get = source.get
+    return get('url'), get('compression', 'none'), get('format', 'hostlist'), get('format_options', {})
+
+
+def _source_key(url, compression, format_type, format_options):
+    # Options may hold lists or mappings, so key on a canonical JSON form
+    options = json.dumps(format_options or {}, sort_keys=True, default=str)
+    return url, compression, format_type, options
+
+
 def fetch_and_parse_source(url, compression, format_type, format_options):
     """
     Fetch and parse a single source list.
     
+    Sources prefetched by prefetch_shared_sources() are served from memory.
+    
     Args:
         url: Source URL or file path
         compression: Compression type ('gzip', 'none')
@@ -160,21 +256,59 @@ def fetch_and_parse_source(url, compression, format_type, format_options):
         format_options: Additional options for parser
         
     Returns:
-        List of parsed entries
+        Tuple of parsed entries
     """
     if not isinstance(url, str) or not url:
         raise ValueError(f"URL must be a non-empty string. Received: '{url}'")
     
-    # Fetch content
-    binary = (compression == 'gzip')
-    content = fetch_content(url, binary)
-    
-    # Decompress if needed
-    content = decompress_content(content, compression)
+    shared = _SHARED_SOURCES.get(_source_key(url, compression, format_type, format_options))
+    if shared is not None:
+        return shared
     
-    # Parse content
     parser = input_parsers.get_parse(format_type)
-    return parser(content.splitlines(), format_options)
+    
+    # Content is downloaded, decompressed and parsed incrementally, so only the
+    # parsed entries are ever held in memory, never the (decompressed) source
+    with open_content(url) as stream:
+        content = decompress_content(stream, compression)
+        return tuple(parser(iter_line_chunks(content), format_options or {}))
+
+
+def find_shared_sources(lists):
+    """Return the arguments of every source referenced by more than one list."""
+    sources = {}
+    users = {}
+    for list_config in lists:
+        keys = set()
+        for source in list_config.get('sources', []):
+            args = _source_args(source)
+            key = _source_key(*args)
+            sources[key] = args
+            keys.add(key)
+        for key in keys:
+            users[key] = users.get(key, 0) + 1
+    return [sources[key] for key, count in users.items() if count > 1]
+
+
+def prefetch_shared_sources(lists):
+    """
+    Fetch and parse sources used by several lists once, up front.
+    
+    Runs in the main process before list workers start, so every worker is
+    handed the parsed entries instead of downloading them again. Sources used
+    by a single list are not kept, so they can be freed once merged.
+    """
+    shared = find_shared_sources(lists)
+    if not shared:
+        return
+    
+    Logger.section(f"Prefetching {len(shared)} source(s) shared between lists")
+    with ThreadPoolExecutor(max_workers=min(MAX_FETCH_WORKERS, len(shared))) as executor:
+        futures = [(args, executor.submit(fetch_and_parse_source, *args)) for args in shared]
+        for args, future in futures:
+            entries = future.result()
+            _SHARED_SOURCES[_source_key(*args)] = entries
+            Logger.info(f"{args[0]} ({len(entries):,} entries)", indent=True)
 
 
 # ============================================================================
@@ -197,21 +331,35 @@ def build_list(name, dedupe_strategy, sources):
         raise ValueError("List must have a 'name' field.")
     
     deduplicator = dedupe.get(dedupe_strategy)
-    Logger.section(f"Fetching {len(sources)} source(s) for '{name}'")
-    
-    for idx, source in enumerate(sources, 1):
-        url = source.get('url')
-        compression = source.get('compression', 'none')
-        format_type = source.get('format', 'hostlist')
-        format_options = source.get('format_options', {})
-        
-        entries = fetch_and_parse_source(url, compression, format_type, format_options)
-        deduplicator.addMany(entries)
+    total = len(sources)
+    Logger.section(f"Fetching {total} source(s) for '{name}'")
+    if not sources:
+        return deduplicator
+    
+    add_many = deduplicator.addMany
+    log_info = Logger.info
+    log_detail = Logger.detail
+    
+    # Sources are fetched concurrently; results are merged on this thread so the
+    # deduplicator is only ever touched by one thread. Merging follows config
+    # order, not completion order: the domain trie's result depends on the
+    # order wildcards and apexes are added, so output must not depend on timing.
+    with ThreadPoolExecutor(max_workers=min(MAX_FETCH_WORKERS, total)) as executor:
+        futures = collections.deque()
+        for idx, source in enumerate(sources, 1):
+            args = _source_args(source)
+            futures.append((idx, args[0], executor.submit(fetch_and_parse_source, *args)))
         
-        # Truncate long URLs for display
-        display_url = url if len(url) < 70 else url[:67] + '...'
-        Logger.info(f"[{idx}/{len(sources)}] {display_url}", indent=True)
-        Logger.detail('Added', f"{len(entries):,} entries → Total: {len(deduplicator):,}", indent=True)
+        # Pop each future once merged so its parsed entries can be freed
+        while futures:
+            idx, url, future = futures.popleft()
+            entries = future.result()
+            add_many(entries)
+            
+            # Truncate long URLs for display
+            display_url = url if len(url) < 70 else url[:67] + '...'
+            log_info(f"[{idx}/{total}] {display_url}", indent=True)
+            log_detail('Added', f"{len(entries):,} entries → Total: {len(deduplicator):,}", indent=True)
     
     return deduplicator
 
@@ -224,9 +372,7 @@ def apply_exclusions(list_items, exclusion_entries):
         list_items: Deduplicator instance to modify
         exclusion_entries: Set of entries to exclude
     """
-    for item in exclusion_entries:
-        if list_items.contains(item):
-            list_items.remove(item)
+    list_items.removeMany(exclusion_entries)
 
 
 def validate_exclusion_list(list_name, exclude_name, lists_with_exclusions):
@@ -243,6 +389,13 @@ def validate_exclusion_list(list_name, exclude_name, lists_with_exclusions):
         )
 
 
+def get_exclude_name(list_config):
+    """Return the name of the list this list excludes, or '' if none."""
+    exclude_value = list_config.get('exclude', '')
+    exclude_name = exclude_value if isinstance(exclude_value, str) else ''
+    return exclude_name.strip()
+
+
 def find_list_config(lists, list_name):
     """Find list configuration by name."""
     config = next((lst for lst in lists if lst.get('name') == list_name), None)
@@ -280,9 +433,7 @@ def process_single_list(list_config, all_lists, exclusion_cache):
     initial_size = len(list_items)
     
     # Apply exclusions if specified
-    exclude_value = list_config.get('exclude', '')
-    exclude_name = exclude_value if isinstance(exclude_value, str) else ''
-    exclude_name = exclude_name.strip()
+    exclude_name = get_exclude_name(list_config)
     
     if exclude_name:
         # Get list of all lists that have exclusions
@@ -328,6 +479,54 @@ def save_list(list_items, output_dir, name, output_format, output_options):
     Logger.success(f"Saved to {output_dir} ({len(list_items):,} entries)")
 
 
+def generate_list(list_config, all_lists, exclusion_cache, output_dir):
+    """
+    Build, filter and save a single list.
+    
+    Returns:
+        Deduplicator instance with final entries
+    """
+    list_items = process_single_list(list_config, all_lists, exclusion_cache)
+    
+    output_format = list_config.get('output_format', 'hostlist_per_family')
+    output_options = list_config.get('output_options', {})
+    save_list(list_items, output_dir, list_config.get('name'), output_format, output_options)
+    
+    return list_items
+
+
+def _init_list_worker(shared_sources):
+    """
+    Give each worker process its own HTTP session rather than the parent's
+    pooled sockets, and the sources prefetched by the parent.
+    """
+    global _SESSION, _SHARED_SOURCES
+    _SESSION = _create_session()
+    _SHARED_SOURCES = shared_sources
+
+
+def _generate_list_worker(list_config, all_lists, exclusion_cache, output_dir):
+    """
+    Worker process entry point for generate_list.
+    
+    Output is captured and handed back so each list's log prints as one block.
+    If the list fails, whatever it logged is printed before the error propagates.
+    
+    Returns:
+        Tuple of (captured log output, number of entries)
+    """
+    log = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(log):
+            list_items = generate_list(list_config, all_lists, exclusion_cache, output_dir)
+    except Exception:
+        # Don't lose what the list logged before failing
+        sys.stdout.write(log.getvalue())
+        sys.stdout.flush()
+        raise
+    return log.getvalue(), len(list_items)
+
+
 def main(config_file, output_dir):
     """
     Main entry point for list generation.
@@ -358,21 +557,54 @@ def main(config_file, output_dir):
     # Cache for exclusion lists
     exclusion_cache = {}
     
-    # Process each list
+    # Lists used as exclusions are built first, in this process, so that their
+    # entries can be shared with every list that references them.
+    exclusion_names = {get_exclude_name(lst) for lst in lists} - {''}
+    exclusion_lists = [lst for lst in lists if lst.get('name') in exclusion_names]
+    other_lists = [lst for lst in lists if lst.get('name') not in exclusion_names]
+    
+    prefetch_shared_sources(lists)
+    
     total_entries = 0
-    for list_config in lists:
-        name = list_config.get('name')
-        
-        # Build and filter list
-        list_items = process_single_list(list_config, lists, exclusion_cache)
-        
-        # Save output
-        output_format = list_config.get('output_format', 'hostlist_per_family')
-        output_options = list_config.get('output_options', {})
-        save_list(list_items, output_dir, name, output_format, output_options)
-        
+    for list_config in exclusion_lists:
+        list_items = generate_list(list_config, lists, exclusion_cache, output_dir)
+        exclusion_cache[list_config.get('name')] = list_items.all()
         total_entries += len(list_items)
     
+    # The remaining lists are independent of each other, so build them in parallel
+    failed = []
+    if other_lists:
+        # Workers share this stdout (a failing one prints its partial log
+        # directly), so get everything printed so far out ahead of them
+        sys.stdout.flush()
+        max_workers = min(os.cpu_count() or 1, len(other_lists))
+        with ProcessPoolExecutor(
+            max_workers=max_workers, initializer=_init_list_worker, initargs=(_SHARED_SOURCES,)
+        ) as executor:
+            futures = [
+                executor.submit(_generate_list_worker, list_config, lists, exclusion_cache, output_dir)
+                for list_config in other_lists
+            ]
+            # Collect every list even after a failure: lists already running
+            # still write their files, so their logs must be printed too
+            for list_config, future in zip(other_lists, futures):
+                try:
+                    log, entry_count = future.result()
+                except Exception as error:
+                    failed.append((list_config.get('name'), error))
+                    continue
+                sys.stdout.write(log)
+                total_entries += entry_count
+    _SHARED_SOURCES.clear()
+    
+    if failed:
+        for name, error in failed:
+            print()
+            Logger.error(f"Failed to generate '{name}'")
+            traceback.print_exception(type(error), error, error.__traceback__, file=sys.stdout)
+        names = ', '.join(f"'{name}'" for name, _ in failed)
+        raise RuntimeError(f"Failed to generate {len(failed)} list(s): {names}")
+    
     # Print completion summary
     print(f"\n{Logger.BOLD}{Logger.GREEN}{'═' * 60}{Logger.RESET}")
     print(f"{Logger.BOLD}{Logger.GREEN}✓ Generation Complete{Logger.RESET}")
@@ -1,36 +1,54 @@
 """
 Helper that fetches and parses input files and yields lines one by one.
+
+Parsers receive the raw (decompressed) content as an iterable of bytes chunks,
+each holding one or more complete lines, and return a lazy iterator of entries.
 """
 
-import json
+import re
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:  # orjson is optional; fall back to the stdlib parser
+    import json
+    _loads = json.loads
 
-def parse_hostlist(lines, opts):
-    return [line.strip() for line in lines if line and not line.startswith('#')]
+# One entry per line, surrounding whitespace trimmed; blank and '#' lines skipped.
+_HOSTLIST_RE = re.compile(rb'(?m)^[ \t]*([^#\s][^\r\n]*?)[ \t\r]*$')
 
-def parse_spamhaus_json(lines, opts):
-    data = [json.loads(line) for line in lines if line]
-    return [item['cidr'] for item in data if 'cidr' in item]
+def parse_hostlist(chunks, opts):
+    findall = _HOSTLIST_RE.findall
+    return (match.decode('utf-8') for chunk in chunks for match in findall(chunk))
 
-def parse_inet_ip_info_geo(lines, opts):
+def parse_spamhaus_json(chunks, opts):
+    return (
+        item['cidr']
+        for chunk in chunks
+        for line in chunk.splitlines() if line and not line.startswith(b'#')
+        for item in (_loads(line),) if 'cidr' in item
+    )
+
+def parse_inet_ip_info_geo(chunks, opts):
     if 'country' not in opts:
         raise ValueError("opts must include 'country' for inet-ip-info-geo strategy")
     
-    country = opts['country'].upper()
-    cells = [line.split('\t') for line in lines if line]
-    return [cell[1].strip() for cell in cells if cell[1] and cell[0] and cell[0].upper() == country]
+    country = opts['country'].upper().encode('utf-8')
+    cells = (line.split(b'\t') for chunk in chunks for line in chunk.splitlines() if line)
+    return (cell[1].strip().decode('utf-8') for cell in cells if cell[1] and cell[0] and cell[0].upper() == country)
+
+_PARSERS = {
+    'hostlist': parse_hostlist,
+    'spamhaus-json': parse_spamhaus_json,
+    'inet-ip-info-geo': parse_inet_ip_info_geo,
+}
 
 def get_parse(strategy):
     """
     Get a parsing function by strategy name.    
     
     """
-    strategy = (strategy or "").lower()
-
-    if strategy == 'hostlist':
-        return parse_hostlist
-    elif strategy == 'spamhaus-json':
-        return parse_spamhaus_json
-    elif strategy == 'inet-ip-info-geo':
-        return parse_inet_ip_info_geo
-    else:
+    parser = _PARSERS.get(strategy) or _PARSERS.get((strategy or "").lower())
+    if parser is None:
         raise ValueError(f"Unknown parsing strategy: {strategy}")
+    return parser
@@ -1,21 +1,37 @@
 """
 Helper to get an output function to write lists to a file format.
+
+Writers expect combined_list to already be sorted, as returned by a
+deduplicator's all().
 """
 
 import os
+from itertools import islice
+
+# Lines are encoded and written in batches of this many.
+_WRITE_BATCH_LINES = 8192
 
 def write_lines(file, content):
-    with open(file, 'w') as f:
-        for line in content:
-            f.write(f"{line}\n")
+    lines = iter(content)
+    with open(file, 'wb', buffering=1024 * 1024) as f:
+        while True:
+            batch = list(islice(lines, _WRITE_BATCH_LINES))
+            if not batch:
+                break
+            batch.append('')  # Trailing newline after the last line
+            f.write('\n'.join(batch).encode('utf-8'))
 
 
 def hostlist_per_family(output_path, output_name, combined_list, opts):
     path = output_path + "/" + output_name
 
-    combined_list = sorted(combined_list)
-    ipv4_list = [item for item in combined_list if '.' in item]
-    ipv6_list = [item for item in combined_list if ':' in item]
+    # ':' only ever appears in IPv6 entries. The first character can't be used
+    # (2001:db8::/32 starts with a digit) and '.' isn't exclusive to IPv4
+    # (::ffff:1.2.3.4), so this single scan is the cheapest reliable test.
+    ipv4_list = []
+    ipv6_list = []
+    for item in combined_list:
+        (ipv6_list if ':' in item else ipv4_list).append(item)
 
     if (len(combined_list) > 0):
         combined_file = path +  ".combined.txt"
@@ -31,7 +47,6 @@ def hostlist_per_family(output_path, output_name, combined_list, opts):
 def rpz_file(output_path, output_name, combined_list, opts):
     path = output_path + "/" + output_name + ".rpz"
 
-    combined_list = sorted(combined_list)
     rpz_lines = [f"{item} CNAME ." for item in combined_list]
 
     if (opts.get('block_subdomains', False)):
@@ -40,6 +55,14 @@ def rpz_file(output_path, output_name, combined_list, opts):
     if (len(rpz_lines) > 0):
         write_lines(path, rpz_lines)
 
+_WRITERS = {
+    "hostlist_per_family": hostlist_per_family,
+    "per_family": hostlist_per_family,
+    "family": hostlist_per_family,
+    "rpz": rpz_file,
+    "none": lambda output_path, output_name, combined_list, opts: None,
+}
+
 def get(output_type):
     """
     Get an output function by type.
@@ -50,12 +73,7 @@ def get(output_type):
       - 'none' -> no output (used for testing and/or exclusions)
     """
 
-    output_type = (output_type or "").lower()
-    if output_type in ("hostlist_per_family", "per_family", "family"):
-        return hostlist_per_family
-    elif output_type in ("rpz"):
-        return rpz_file
-    elif output_type in ("none"):
-        return lambda output_path, output_name, combined_list, opts: None
-
-    raise ValueError(f"Unknown output type: {output_type}")
\ No newline at end of file
+    writer = _WRITERS.get(output_type) or _WRITERS.get((output_type or "").lower())
+    if writer is None:
+        raise ValueError(f"Unknown output type: {output_type}")
+    return writer
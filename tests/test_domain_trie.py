@@ -1,3 +1,4 @@
+import sys
 import unittest
 
 from dedupe.domainTrie import DomainTrie
@@ -79,11 +80,50 @@ class DomainTrieTests(unittest.TestCase):
         self.assertIn("*.test.com", domains)
         self.assertEqual(len(domains), 3)
 
+    def test_len_tracks_wildcard_and_apex(self):
+        self.trie.add("a.example.com")
+        self.trie.add("b.example.com")
+        self.trie.add("example.com")
+        self.trie.add("example.com")  # Duplicate is not counted twice
+        self.assertEqual(len(self.trie), 3)
+
+        # Wildcard replaces everything at and below its node
+        self.trie.add("*.example.com")
+        self.assertEqual(len(self.trie), 1)
+
+        # Apex can coexist with the wildcard
+        self.trie.add("example.com")
+        self.assertEqual(len(self.trie), 2)
+
+        # Re-adding the wildcard clears the apex again
+        self.trie.add("*.example.com")
+        self.assertEqual(len(self.trie), 1)
+
+        self.trie.remove("*.example.com")
+        self.assertEqual(len(self.trie), 0)
+
+    def test_iteration_reflects_changes_between_calls(self):
+        self.trie.add("b.example.com")
+        self.trie.add("a.example.com")
+        self.assertEqual(list(self.trie.iter_domains()), ["a.example.com", "b.example.com"])
+
+        self.trie.add("c.example.com")
+        self.trie.remove("a.example.com")
+        self.assertEqual(list(self.trie.iter_domains()), ["b.example.com", "c.example.com"])
+
+        self.trie.add("*.example.com")
+        self.assertEqual(list(self.trie.iter_domains()), ["*.example.com"])
+
     def test_deep_nesting(self):
         self.assertTrue(self.trie.add("a.b.c.d.e.f.g.com"))
         self.assertTrue(self.trie.contains("a.b.c.d.e.f.g.com"))
         self.assertFalse(self.trie.contains("b.c.d.e.f.g.com"))
 
+    def test_iteration_deeper_than_recursion_limit(self):
+        deep = ".".join(["a"] * (sys.getrecursionlimit() + 100)) + ".com"
+        self.assertTrue(self.trie.add(deep))
+        self.assertEqual(list(self.trie.iter_domains()), [deep])
+
     def test_wildcard_only_one_level_deep(self):
         # Wildcard matches exactly one additional label
         self.assertTrue(self.trie.add("*.example.com"))
@@ -143,6 +183,22 @@ class DomainTrieTests(unittest.TestCase):
         self.assertTrue(self.trie.remove("x.b.c.example.com"))
         self.assertEqual(len(self.trie), 0)
 
+    def test_released_nodes_are_reused(self):
+        self.trie.add("a.b.c.example.com")
+        self.trie.add("x.y.example.org")
+        allocated = len(self.trie._labels)
+
+        # Freed by remove() and by a wildcard clearing its subtree
+        self.trie.remove("a.b.c.example.com")
+        self.trie.add("*.example.org")
+        self.trie.add("d.example.net")
+        self.trie.add("g.example.com")
+        self.assertEqual(len(self.trie._labels), allocated)
+        self.assertEqual(
+            sorted(self.trie.iter_domains()),
+            ["*.example.org", "d.example.net", "g.example.com"],
+        )
+
     def test_remove_with_normalization(self):
         self.assertTrue(self.trie.add("Example.COM"))
         self.assertTrue(self.trie.contains("example.com"))
@@ -159,6 +215,29 @@ class DomainTrieTests(unittest.TestCase):
         self.assertTrue(self.trie.remove("example.com"))
         self.assertTrue(self.trie.contains("foo.example.com"))  # Wildcard still works
 
+    def test_load_from_iter(self):
+        trie = DomainTrie.load_from_iter([
+            "# comment",
+            "",
+            "  Foo.Example.com  ",
+            "example.com",
+            "a.b.example.org",
+            "*.b.example.org",
+            "*.example.org",
+        ])
+        self.assertEqual(
+            sorted(trie.iter_domains()),
+            ["*.example.org", "example.com", "foo.example.com"],
+        )
+        self.assertEqual(len(trie), 3)
+        self.assertTrue(trie.contains("x.example.org"))
+
+    def test_load_from_iter_keeps_apex_regardless_of_order(self):
+        trie = DomainTrie.load_from_iter(["example.com", "*.example.com"])
+        self.assertTrue(trie.contains("example.com"))
+        self.assertTrue(trie.contains("foo.example.com"))
+        self.assertEqual(len(trie), 2)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,89 @@
+import io
+import unittest
+
+import input as input_parsers
+from generate import iter_line_chunks
+
+def parse(strategy, data, opts=None, chunk_size=1024):
+    chunks = iter_line_chunks(io.BytesIO(data), chunk_size)
+    return list(input_parsers.get_parse(strategy)(chunks, opts or {}))
+
+class HostlistParserTests(unittest.TestCase):
+    def test_skips_comments_and_blank_lines(self):
+        data = b"# header\n1.2.3.4\n\n   \n  # indented comment\n\t10.0.0.0/8  \n"
+        self.assertEqual(parse("hostlist", data), ["1.2.3.4", "10.0.0.0/8"])
+
+    def test_crlf_line_endings(self):
+        data = b"# header\r\nexample.com\r\n\r\nexample.org \r\n"
+        self.assertEqual(parse("hostlist", data), ["example.com", "example.org"])
+
+    def test_final_line_without_newline(self):
+        self.assertEqual(parse("hostlist", b"a.com\nb.com"), ["a.com", "b.com"])
+        self.assertEqual(parse("hostlist", b"a.com\r\nb.com\r"), ["a.com", "b.com"])
+
+    def test_input_split_across_chunks(self):
+        data = b"# comment line\r\nexample.com\n  foo.example.com\n\nbar.example.org\r\nlast.net"
+        expected = ["example.com", "foo.example.com", "bar.example.org", "last.net"]
+        for chunk_size in (1, 3, 7, 16):
+            self.assertEqual(parse("hostlist", data, chunk_size=chunk_size), expected)
+
+    def test_empty_input(self):
+        self.assertEqual(parse("hostlist", b""), [])
+
+    def test_parsers_are_lazy(self):
+        def chunks():
+            raise AssertionError("chunks consumed before iteration")
+            yield b""
+
+        for strategy in ("hostlist", "spamhaus-json", "inet-ip-info-geo"):
+            input_parsers.get_parse(strategy)(chunks(), {"country": "AU"})
+
+class SpamhausJsonParserTests(unittest.TestCase):
+    def test_extracts_cidrs(self):
+        data = (
+            b'{"cidr":"1.10.16.0/20","sblid":"SBL256894","rir":"apnic"}\n'
+            b'{"cidr":"2001:db8::/32","sblid":"SBL1","rir":"ripencc"}\r\n'
+            b'\n'
+            b'{"type":"metadata","timestamp":1700000000,"size":2}'
+        )
+        expected = ["1.10.16.0/20", "2001:db8::/32"]
+        self.assertEqual(parse("spamhaus-json", data), expected)
+        self.assertEqual(parse("spamhaus-json", data, chunk_size=5), expected)
+
+    def test_skips_comment_lines(self):
+        data = b'# generated file\n{"cidr":"10.0.0.0/8"}\n'
+        self.assertEqual(parse("spamhaus-json", data), ["10.0.0.0/8"])
+
+class InetIpInfoGeoParserTests(unittest.TestCase):
+    DATA = b"AU\t1.0.0.0/24\nUS\t2.0.0.0/8\nau\t3.0.0.0/8 \r\n\nJP\t\nAU\t4.0.0.0/8"
+
+    def test_filters_by_country(self):
+        self.assertEqual(
+            parse("inet-ip-info-geo", self.DATA, {"country": "au"}),
+            ["1.0.0.0/24", "3.0.0.0/8", "4.0.0.0/8"],
+        )
+        self.assertEqual(parse("inet-ip-info-geo", self.DATA, {"country": "US"}), ["2.0.0.0/8"])
+        self.assertEqual(parse("inet-ip-info-geo", self.DATA, {"country": "JP"}), [])
+
+    def test_input_split_across_chunks(self):
+        self.assertEqual(
+            parse("inet-ip-info-geo", self.DATA, {"country": "AU"}, chunk_size=4),
+            ["1.0.0.0/24", "3.0.0.0/8", "4.0.0.0/8"],
+        )
+
+    def test_requires_country(self):
+        # Checked up front, not when the entries are first iterated
+        with self.assertRaises(ValueError):
+            input_parsers.parse_inet_ip_info_geo(iter([self.DATA]), {})
+
+class GetParseTests(unittest.TestCase):
+    def test_lookup_is_case_insensitive(self):
+        self.assertIs(input_parsers.get_parse("HostList"), input_parsers.parse_hostlist)
+
+    def test_unknown_strategy(self):
+        with self.assertRaises(ValueError):
+            input_parsers.get_parse("csv")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,10 +5,13 @@
 # by more than ±10% compared to the previous version in the git repository.
 # Intended for use as part of GitHub Actions workflow, but can be run manually as well.
 
+import functools
 import glob
 import os
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Iterator, Optional
 
 cli_help = """
 Usage: python verify.py <path_to_lists> <threshold_percent> <allow_deletions>
@@ -17,46 +20,105 @@ Usage: python verify.py <path_to_lists> <threshold_percent> <allow_deletions>
   allow_deletions: 'true' to allow file deletions, 'false' to disallow
 """
 
-def normalize_paths(paths: str, start: str) -> str:
-    return [os.path.normpath(os.path.relpath(p, start)) for p in paths]
+def normalize_paths(paths: Iterable[str], start: str) -> Iterator[str]:
+    # glob returns relative paths when given a relative pattern; those are
+    # already relative to ".", so only absolute ones need relpath.
+    return (
+        os.path.normpath(p) if start == "." and not os.path.isabs(p)
+        else os.path.normpath(os.path.relpath(p, start))
+        for p in paths
+    )
 
-def old_line_count(path: str) -> int:
-    try:
-        data = subprocess.check_output(
-            ["git", "show", f"HEAD:{path}"],
+class HeadBlobReader:
+    """
+    Reads file contents as of HEAD through one long-lived `git cat-file --batch`
+    process, instead of spawning a `git show` per file.
+    """
+
+    def __init__(self):
+        self.proc = subprocess.Popen(
+            ["git", "cat-file", "--batch"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
             stderr=subprocess.DEVNULL,
-            text=True,
         )
-        return len(data.splitlines())
-    except subprocess.CalledProcessError:
+
+    def read(self, path: str) -> Optional[bytes]:
+        """Return the blob at HEAD:path, or None if there is no such file."""
+        self.proc.stdin.write(f"HEAD:{path}\n".encode())
+        self.proc.stdin.flush()
+
+        # "<oid> <type> <size>" followed by the content and a newline,
+        # or "<object> missing" (and similar) with no content. The object
+        # name echoes the path, which may contain spaces, so only a numeric
+        # last field means content follows.
+        header = self.proc.stdout.readline().split()
+        if len(header) != 3 or not header[2].isdigit():
+            return None
+        data = self.proc.stdout.read(int(header[2]))
+        self.proc.stdout.read(1)
+        return data if header[1] == b"blob" else None
+
+    def close(self):
+        self.proc.stdin.close()
+        self.proc.wait()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def old_line_count(path: str, head: HeadBlobReader) -> int:
+    """Count lines in the HEAD version of a file the same way count_lines does."""
+    data = head.read(path)
+    if not data:
         return 0
+    return data.count(b"\n") + (0 if data.endswith(b"\n") else 1)
+
+def count_lines(path: str) -> int:
+    """Count lines in a file, including a final line without a trailing newline."""
+    count = 0
+    last = b"\n"
+    with open(path, "rb", buffering=0) as f:
+        while True:
+            chunk = f.read(1 << 20)
+            if not chunk:
+                break
+            count += chunk.count(b"\n")
+            last = chunk[-1:]
+    return count + (0 if last == b"\n" else 1)
 
 def percent_change(old: int, new: int) -> float:
     if old == 0:
         return 100.0 if new else 0.0
     return ((new - old) / old) * 100.0
 
+@functools.lru_cache(maxsize=None)
 def tracked_lists_in_head(path: str):
+    # -z separates names with NUL and leaves unusual file names unquoted
     output = subprocess.check_output(
-        ["git", "ls-tree", "--name-only", "HEAD", path + "/"],
-        text=True,
+        ["git", "ls-tree", "-z", "--name-only", "HEAD", path + "/"],
     )
-    return {line.strip() for line in output.splitlines() if line.strip().endswith(".txt")}
+    return frozenset(os.fsdecode(name) for name in output.split(b"\0") if name.endswith(b".txt"))
 
 def passes_delete_check(base_path, files, allowed: bool) -> bool:
-    head_files = set(normalize_paths(tracked_lists_in_head(base_path), "."))
-    # Normalize the current files; Strictly speaking this should not be necessary
-    # since glob.glob should return normalized paths, but just in case.
-    current_files = set(normalize_paths(files, "."))
-
-    for f in head_files - current_files:
-        print(f"{f}: Deleted")
-        if not allowed:
-            print("File deletions are not allowed.")
-            return False
-    if (allowed):
+    if allowed:
+        # Nothing to enforce, so skip listing HEAD altogether
         print("File deletions are allowed.")
-    
+        return True
+
+    # Both sides only hold files directly inside base_path, so comparing file
+    # names is enough; no need to normalize every path.
+    head_names = {os.path.basename(p) for p in tracked_lists_in_head(base_path)}
+    current_names = {os.path.basename(p) for p in files}
+
+    list_dir = os.path.normpath(base_path)
+    for name in head_names - current_names:
+        print(f"{os.path.join(list_dir, name)}: Deleted")
+        print("File deletions are not allowed.")
+        return False
+
     return True
 
 def main(base_path: str, threshold: float, allow_delete: bool) -> int:
@@ -66,15 +128,19 @@ def main(base_path: str, threshold: float, allow_delete: bool) -> int:
         return 1
 
     violations = []
-    for path in files:
-        new_lines = sum(1 for _ in open(path, encoding="utf-8"))
-        old_lines = old_line_count(path)
-        if old_lines == 0:
-            print(f"{path}: {new_lines} lines (new file)")
-            continue  # New file, skip check
-        pct = percent_change(old_lines, new_lines)
-        if abs(pct) > threshold:
-            violations.append((path, old_lines, new_lines, pct))
+    # Current files are counted on a thread pool while HEAD versions are read
+    # here, so the single cat-file pipe is only ever used from one thread.
+    with ThreadPoolExecutor(max_workers=8) as pool, HeadBlobReader() as head:
+        new_counts = [pool.submit(count_lines, path) for path in files]
+        for path, new_count in zip(files, new_counts):
+            old_lines = old_line_count(path, head)
+            new_lines = new_count.result()
+            if old_lines == 0:
+                print(f"{path}: {new_lines} lines (new file)")
+                continue  # New file, skip check
+            pct = percent_change(old_lines, new_lines)
+            if abs(pct) > threshold:
+                violations.append((path, old_lines, new_lines, pct))
 
     if violations:
         for path, old_lines, new_lines, pct in violations: